@@ -4,7 +4,13 @@
 
 __all__ = [
     "models",
+    "canonical",
+    "dedup",
     "solver",
     "generator",
+    "jobs",
+    "portfolio",
+    "session",
     "utils",
+    "validator",
 ]
@@ -0,0 +1,115 @@
+# gridcracker/canonical.py
+
+import hashlib
+from itertools import permutations
+from typing import List, Tuple
+
+from .validator import check_grid
+
+# all 6^4 column orders that keep stacks together (stack order, then column order per stack)
+_TRIPLES = list(permutations(range(3)))
+COLUMN_ORDERS = [
+    tuple(stack * 3 + i for stack, inner in zip(stacks, inners) for i in inner)
+    for stacks in _TRIPLES
+    for inners in ((a, b, c) for a in _TRIPLES for b in _TRIPLES for c in _TRIPLES)
+]
+
+
+def _relabel(row: tuple, mapping: list, next_label: int) -> Tuple[tuple, int]:
+    """Rename digits of row in order of first appearance (mapping is updated in place)."""
+    out = []
+    for v in row:
+        if v and not mapping[v]:
+            mapping[v] = next_label
+            next_label += 1
+        out.append(mapping[v])
+    return tuple(out), next_label
+
+
+def _future_key(rows: list, used: int, band: int, mapping: list, next_label: int, step: int) -> tuple:
+    """States with equal keys produce the same best completion, so only one needs expanding."""
+
+    def render(r):
+        # unmapped digits keep their identity (negated) so only truly equal futures merge
+        return tuple(mapping[v] if mapping[v] or not v else -v for v in rows[r])
+
+    if step % 3:
+        current = tuple(sorted(render(r) for r in range(band * 3, band * 3 + 3) if not used >> r & 1))
+    else:
+        current = ()
+    free_bands = tuple(sorted(
+        tuple(sorted(render(r) for r in range(b * 3, b * 3 + 3)))
+        for b in range(3)
+        if not used >> (b * 3) & 7
+    ))
+    return next_label, current, free_bands
+
+
+def canonical_form(grid: List[List[int]]) -> Tuple[int, ...]:
+    """Minimal representative of a grid under the Sudoku symmetry group, as 81 values.
+
+    The group is generated by transposition, band and stack permutations, row and column
+    permutations within a band or stack, and relabelling of the digits 1-9. Two grids are
+    equivalent exactly when their canonical forms are equal. The search builds the result
+    row by row and keeps only the partial transformations that reach the smallest prefix.
+    """
+    base = tuple(tuple(row) for row in check_grid(grid))
+    transposed = tuple(zip(*base))
+
+    # step 0: pick the first row (any row, either orientation, any column order). Digits in a
+    # row are distinct, so after relabelling only its zero pattern matters: the smallest
+    # pattern puts emptier stacks first and the zeros first within each stack.
+    best = None
+    starts = []
+    for g in (base, transposed):
+        for r in range(9):
+            filled = sorted(sum(1 for c in range(s * 3, s * 3 + 3) if g[r][c]) for s in range(3))
+            pattern = tuple(int(i >= 3 - n) for n in filled for i in range(3))
+            if best is None or pattern < best:
+                best, starts = pattern, []
+            if pattern == best:
+                starts.append((g, r))
+    states = []
+    for g, r in starts:
+        for order in COLUMN_ORDERS:
+            if tuple(1 if g[r][c] else 0 for c in order) == best:
+                mapping = [0] * 10
+                out, nxt = _relabel(tuple(g[r][c] for c in order), mapping, 1)
+                states.append((g, order, 1 << r, r // 3, mapping, nxt))
+    best = out  # every start relabels to the same first row
+    prefix = [best]
+
+    # steps 1-8: extend every surviving state by one row, keep the minimal ones
+    for step in range(1, 9):
+        best = None
+        survivors = []
+        seen = set()
+        for g, order, used, band, mapping, nxt in states:
+            if step % 3:
+                choices = [r for r in range(band * 3, band * 3 + 3) if not used >> r & 1]
+            else:
+                choices = [r for r in range(9) if not used >> (r // 3 * 3) & 7]
+            rows = None
+            for r in choices:
+                new_mapping = mapping[:]
+                out, new_nxt = _relabel(tuple(g[r][c] for c in order), new_mapping, nxt)
+                if best is not None and out > best:
+                    continue
+                if best is None or out < best:
+                    best, survivors, seen = out, [], set()
+                new_used = used | 1 << r
+                if rows is None:
+                    rows = [tuple(g[i][c] for c in order) for i in range(9)]
+                key = _future_key(rows, new_used, r // 3, new_mapping, new_nxt, step + 1)
+                if key in seen:
+                    continue
+                seen.add(key)
+                survivors.append((g, order, new_used, r // 3, new_mapping, new_nxt))
+        states = survivors
+        prefix.append(best)
+    return tuple(v for row in prefix for v in row)
+
+
+def canonical_hash(grid: List[List[int]]) -> str:
+    """Compact 128-bit hex digest of the canonical form; equal for equivalent grids."""
+    return hashlib.blake2b(bytes(canonical_form(grid)), digest_size=16).hexdigest()
@@ -0,0 +1,340 @@
+# gridcracker/dedup.py
+
+import math
+import os
+import struct
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # no advisory locks (Windows): a state file must then have a single writer
+    fcntl = None
+
+from .canonical import canonical_hash
+from .utils.file_io import FileHandler
+
+DIGEST_SIZE = 16  # bytes per canonical_hash
+
+
+def _write_bytes_atomic(path: str, chunks) -> None:
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=".tmp-", suffix=".bin")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class ExactDeduper:
+    """Remembers the canonical hash of every puzzle seen; no false positives in practice (128-bit hashes).
+
+    Saved as a magic header followed by the raw 16-byte digests.
+    """
+
+    MAGIC = b"GCDEDUPX"
+
+    def __init__(self):
+        self._seen = set()
+
+    def add_hash(self, digest: str) -> bool:
+        """Record a canonical hash. Returns True if it was not seen before."""
+        key = bytes.fromhex(digest)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        return True
+
+    def add(self, grid: List[List[int]]) -> bool:
+        """Record a puzzle. Returns True if no equivalent puzzle was seen before."""
+        return self.add_hash(canonical_hash(grid))
+
+    def merge(self, other: "ExactDeduper") -> None:
+        self._seen |= other._seen
+
+    def __contains__(self, grid: List[List[int]]) -> bool:
+        return bytes.fromhex(canonical_hash(grid)) in self._seen
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    @property
+    def shape(self) -> tuple:
+        return ()
+
+    @classmethod
+    def read_shape(cls, path: str) -> tuple:
+        with open(path, "rb") as f:
+            if f.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError(f"'{path}' is not an exact dedup state file.")
+        return ()
+
+    def save(self, path: str) -> None:
+        _write_bytes_atomic(path, [self.MAGIC, b"".join(self._seen)])
+
+    @classmethod
+    def load(cls, path: str) -> "ExactDeduper":
+        with open(path, "rb") as f:
+            if f.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError(f"'{path}' is not an exact dedup state file.")
+            data = f.read()
+        if len(data) % DIGEST_SIZE:
+            raise ValueError(f"'{path}' is truncated.")
+        dedup = cls()
+        dedup._seen = {data[i:i + DIGEST_SIZE] for i in range(0, len(data), DIGEST_SIZE)}
+        return dedup
+
+
+class BloomDeduper:
+    """Memory-bounded dedup over canonical hashes.
+
+    Never lets a duplicate through; with probability about `error_rate` (once `capacity`
+    puzzles are stored) a new puzzle is wrongly reported as seen and gets skipped.
+    """
+
+    MAGIC = b"GCDEDUPB"
+    _HEADER = struct.Struct("<QQQ")  # bits, hashes, count
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 1e-6):
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate between 0 and 1.")
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, digest: str):
+        # double hashing: the 128-bit digest gives two independent 64-bit values
+        key = bytes.fromhex(digest)
+        h1 = int.from_bytes(key[:8], "little")
+        h2 = int.from_bytes(key[8:16], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add_hash(self, digest: str) -> bool:
+        """Record a canonical hash. Returns True if it was (probably) not seen before."""
+        new = False
+        for pos in self._positions(digest):
+            byte, bit = divmod(pos, 8)
+            if not self.bits[byte] >> bit & 1:
+                self.bits[byte] |= 1 << bit
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def add(self, grid: List[List[int]]) -> bool:
+        """Record a puzzle. Returns True if no equivalent puzzle was (probably) seen before."""
+        return self.add_hash(canonical_hash(grid))
+
+    def merge(self, other: "BloomDeduper") -> None:
+        """Union with a filter of the same size; count is re-estimated from the set bits."""
+        if (other.num_bits, other.num_hashes) != (self.num_bits, self.num_hashes):
+            raise ValueError("Cannot merge Bloom filters with different sizes.")
+        merged = int.from_bytes(self.bits, "little") | int.from_bytes(other.bits, "little")
+        self.bits = bytearray(merged.to_bytes(len(self.bits), "little"))
+        # both sides may hold the same puzzles, so counts cannot simply be added
+        set_bits = min(merged.bit_count(), self.num_bits - 1)
+        self.count = int(round(-self.num_bits / self.num_hashes * math.log(1 - set_bits / self.num_bits)))
+
+    def __contains__(self, grid: List[List[int]]) -> bool:
+        return all(self.bits[pos // 8] >> (pos % 8) & 1 for pos in self._positions(canonical_hash(grid)))
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.num_bits, self.num_hashes
+
+    @classmethod
+    def _read_header(cls, f, path: str) -> Tuple[int, int, int]:
+        if f.read(len(cls.MAGIC)) != cls.MAGIC:
+            raise ValueError(f"'{path}' is not a Bloom dedup state file.")
+        header = f.read(cls._HEADER.size)
+        if len(header) != cls._HEADER.size:
+            raise ValueError(f"'{path}' is truncated.")
+        return cls._HEADER.unpack(header)
+
+    @classmethod
+    def read_shape(cls, path: str) -> Tuple[int, int]:
+        with open(path, "rb") as f:
+            num_bits, num_hashes, _ = cls._read_header(f, path)
+        return num_bits, num_hashes
+
+    def save(self, path: str) -> None:
+        _write_bytes_atomic(path, [self.MAGIC, self._HEADER.pack(self.num_bits, self.num_hashes, self.count), self.bits])
+
+    @classmethod
+    def load(cls, path: str) -> "BloomDeduper":
+        with open(path, "rb") as f:
+            num_bits, num_hashes, count = cls._read_header(f, path)
+            bits = bytearray(f.read())
+        if len(bits) != (num_bits + 7) // 8:
+            raise ValueError(f"'{path}' is truncated or corrupt: expected {(num_bits + 7) // 8} bytes of filter, got {len(bits)}.")
+        bloom = cls.__new__(cls)
+        bloom.num_bits, bloom.num_hashes, bloom.count, bloom.bits = num_bits, num_hashes, count, bits
+        return bloom
+
+
+DEDUPERS = {"exact": ExactDeduper, "bloom": BloomDeduper}
+
+
+def make_deduper(kind: str, capacity: int = 1_000_000, error_rate: float = 1e-6):
+    """Build a deduper by name: "exact" or "bloom"."""
+    if kind == "exact":
+        return ExactDeduper()
+    if kind == "bloom":
+        return BloomDeduper(capacity, error_rate)
+    raise ValueError(f"Unknown dedup mode '{kind}'. Choose 'exact' or 'bloom'.")
+
+
+STATE_CAPACITY = 10_000_000  # Bloom size for persistent states shared between runs
+
+
+@contextmanager
+def state_lock(path: str):
+    """Hold an exclusive lock on `<path>.lock` while a shared state file is read and rewritten."""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".lock", "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def load_deduper(kind: str, path: Optional[str], capacity: int = STATE_CAPACITY):
+    """Load the persistent dedup state at path, creating an empty one there first if needed.
+
+    Creating the file up front fixes the filter size for every run that shares it, so a
+    later merge cannot fail on a size mismatch.
+    """
+    if kind not in DEDUPERS:
+        raise ValueError(f"Unknown dedup mode '{kind}'. Choose 'exact' or 'bloom'.")
+    if not path:
+        return make_deduper(kind, capacity=capacity)
+    with state_lock(path):
+        if not os.path.exists(path):
+            make_deduper(kind, capacity=capacity).save(path)
+        return DEDUPERS[kind].load(path)
+
+
+def check_mergeable(dedup, path: str) -> None:
+    """Raise ValueError now if dedup could not later be merged into the state file at path."""
+    if os.path.exists(path) and type(dedup).read_shape(path) != dedup.shape:
+        raise ValueError(f"Dedup state '{path}' has a different filter size than this run.")
+
+
+def save_deduper(dedup, path: str) -> None:
+    """Merge dedup into the state file at path and save atomically.
+
+    The read-merge-write runs under state_lock, so runs sharing the file do not drop each
+    other's puzzles (on platforms without fcntl, only one run may write it at a time).
+    """
+    with state_lock(path):
+        if os.path.exists(path):
+            on_disk = type(dedup).load(path)
+            on_disk.merge(dedup)
+            dedup = on_disk
+        dedup.save(path)
+
+
+class PuzzleStoreIndex:
+    """Sidecar index of canonical hashes for a saved-puzzle JSON store.
+
+    Lets a save check for an equivalent stored puzzle with one hash and a dict lookup
+    instead of re-canonicalising the whole store. The index records the store file's
+    mtime and size; only when those changed (the store was edited outside the index) are
+    the entries re-checked, and only added or edited puzzles are hashed again.
+    """
+
+    def __init__(self, store_path: str):
+        root, _ = os.path.splitext(store_path)
+        self.store_path = store_path
+        self.path = root + ".index.json"
+        try:
+            data = FileHandler.load_json(self.path)
+        except FileNotFoundError:
+            data = {}
+        self.store_stamp = data.get("store")
+        self.entries: Dict[str, Dict[str, str]] = data.get("entries", {})
+        self._by_hash: Dict[str, List[str]] = {}
+        for name, entry in self.entries.items():
+            self._by_hash.setdefault(entry["hash"], []).append(name)
+        self._dirty = False
+
+    @staticmethod
+    def _fingerprint(grid: List[List[int]]) -> str:
+        return "".join(str(v) for row in grid for v in row)
+
+    def _stamp(self) -> Optional[List[int]]:
+        try:
+            st = os.stat(self.store_path)
+        except FileNotFoundError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+
+    def _remove(self, name: str) -> None:
+        entry = self.entries.pop(name, None)
+        if entry:
+            names = self._by_hash[entry["hash"]]
+            names.remove(name)
+            if not names:
+                del self._by_hash[entry["hash"]]
+            self._dirty = True
+
+    def _set(self, name: str, fingerprint: str, digest: str) -> None:
+        self._remove(name)
+        self.entries[name] = {"grid": fingerprint, "hash": digest}
+        self._by_hash.setdefault(digest, []).append(name)
+        self._dirty = True
+
+    def refresh(self) -> None:
+        """Bring the index in line with the store if the store changed since the last save."""
+        stamp = self._stamp()
+        if stamp == self.store_stamp:
+            return
+        stored = FileHandler.load_json(self.store_path) if stamp else {}
+        for name in list(self.entries):
+            if name not in stored:
+                self._remove(name)
+        for name, grid in stored.items():
+            try:
+                fingerprint = self._fingerprint(grid)
+            except TypeError:
+                continue  # skip malformed entries in the store
+            entry = self.entries.get(name)
+            if entry and entry["grid"] == fingerprint:
+                continue
+            try:
+                self._set(name, fingerprint, canonical_hash(grid))
+            except ValueError:
+                self._remove(name)
+        self._dirty = True
+
+    def find(self, grid: List[List[int]]) -> Optional[str]:
+        """Name of a stored puzzle equivalent to grid under the Sudoku symmetries, if any."""
+        names = self._by_hash.get(canonical_hash(grid))
+        return names[0] if names else None
+
+    def add(self, name: str, grid: List[List[int]]) -> None:
+        self._set(name, self._fingerprint(grid), canonical_hash(grid))
+
+    def save(self) -> None:
+        """Write the index, stamped with the store as it is now (call after writing the store)."""
+        if self._dirty:
+            self.store_stamp = self._stamp()
+            FileHandler.write_json_atomic({"store": self.store_stamp, "entries": self.entries}, self.path)
+            self._dirty = False
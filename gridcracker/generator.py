@@ -1,7 +1,7 @@
 # gridcracker/generator.py
 
 import random
-from typing import List
+from typing import List, Optional
 from .models import Board
 from .solver import CountingSolver, SudokuSolver
 import os
@@ -27,8 +27,15 @@ class SudokuGenerator:
         "Hard": 54,
     }
 
-    def __init__(self, difficulty: str = "Medium", ai_model_path: str = "gridcracker_ai/model/sudoku_ai.joblib"):
+    def __init__(
+        self,
+        difficulty: str = "Medium",
+        ai_model_path: str = "gridcracker_ai/model/sudoku_ai.joblib",
+        rng: Optional[random.Random] = None,
+    ):
         self.difficulty = difficulty if difficulty in self.DIFFICULTY_REMOVALS else "Medium"
+        # pass a seeded Random for reproducible output; defaults to the global generator
+        self.rng = rng or random
         self.ai_model = None
         if joblib_load:
             try:
@@ -42,7 +49,7 @@ class SudokuGenerator:
             return True
         r, c = empty
         nums = list(range(1, 10))
-        random.shuffle(nums)
+        self.rng.shuffle(nums)
         for num in nums:
             if board.is_valid(r, c, num):
                 board.set(r, c, num)
@@ -56,7 +63,7 @@ class SudokuGenerator:
         # To speed up, fill diagonal boxes with random permutations
         for box in range(0, 9, 3):
             nums = list(range(1, 10))
-            random.shuffle(nums)
+            self.rng.shuffle(nums)
             idx = 0
             for r in range(box, box + 3):
                 for c in range(box, box + 3):
@@ -69,8 +76,8 @@ class SudokuGenerator:
     def _remove_cells(self, board: Board, removals: int) -> Board:
         attempts = removals
         while attempts > 0:
-            r = random.randrange(9)
-            c = random.randrange(9)
+            r = self.rng.randrange(9)
+            c = self.rng.randrange(9)
             if board.get(r, c) == 0:
                 continue
             # backup
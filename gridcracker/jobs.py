@@ -0,0 +1,224 @@
+# gridcracker/jobs.py
+
+import os
+import random
+import time
+from typing import Callable, List, Optional
+
+from .dedup import STATE_CAPACITY, check_mergeable, load_deduper, make_deduper, save_deduper
+from .generator import SudokuGenerator
+from .utils.file_io import FileHandler
+
+
+def _encode_rng_state(state: tuple) -> list:
+    version, internal, gauss_next = state
+    return [version, list(internal), gauss_next]
+
+
+def _decode_rng_state(state: list) -> tuple:
+    version, internal, gauss_next = state
+    return version, tuple(internal), gauss_next
+
+
+class GenerationJob:
+    """Bulk puzzle generation that checkpoints into a job directory and can resume.
+
+    The run is split into shards of `shard_size` puzzles, each with its own RNG seeded
+    from the job seed. Every `checkpoint_every` puzzles (or `checkpoint_seconds`, whichever
+    comes first) the shard's output so far and its RNG state are written atomically, so a
+    restarted job continues from the last checkpoint and produces the same puzzles as an
+    uninterrupted run. Parameters left as None are taken from an existing job.json.
+    With `dedup_state`, the persistent dedup file (created if missing) is snapshotted when
+    the job starts, and every completed shard is merged back into it; a finished run merges
+    once more, so a job stopped between its last shard and that merge catches up on resume.
+    Later runs and jobs then skip puzzles this job issued. With `dedup` ("exact" or "bloom") a puzzle
+    equivalent to an earlier one is regenerated; the filter is rebuilt from the checkpoints
+    on resume.
+
+    Layout of the job directory:
+        job.json                      parameters (count, difficulty, seed, shard_size, dedup, dedup_state)
+        dedup_base.bin                snapshot of the dedup state file when the job started
+        progress.json                 puzzles done, throughput and ETA of the last run
+        shards/shard_00000.json       completed shard
+        shards/shard_00001.partial.json  in-progress shard with its RNG state
+    """
+
+    DEFAULTS = {"difficulty": "Medium", "shard_size": 100, "dedup": None, "dedup_state": None}
+
+    def __init__(
+        self,
+        job_dir: str,
+        count: Optional[int] = None,
+        difficulty: Optional[str] = None,
+        seed: Optional[int] = None,
+        shard_size: Optional[int] = None,
+        dedup: Optional[str] = None,
+        dedup_state: Optional[str] = None,
+        checkpoint_every: int = 10,
+        checkpoint_seconds: float = 30.0,
+    ):
+        self.job_dir = job_dir
+        self.job_path = os.path.join(job_dir, "job.json")
+        self.progress_path = os.path.join(job_dir, "progress.json")
+        self.shard_dir = os.path.join(job_dir, "shards")
+        self.dedup_base_path = os.path.join(job_dir, "dedup_base.bin")
+        given = {
+            "count": count,
+            "difficulty": difficulty,
+            "seed": seed,
+            "shard_size": shard_size,
+            "dedup": dedup,
+            "dedup_state": dedup_state,
+        }
+        if os.path.exists(self.job_path):
+            # resuming: only values the caller actually passed must agree with the job
+            params = FileHandler.load_json(self.job_path)
+            for key, value in given.items():
+                if value is not None and params.get(key) != value:
+                    raise ValueError(
+                        f"Job in '{job_dir}' was started with {key}={params.get(key)!r}, not {value!r}."
+                    )
+        else:
+            if count is None:
+                raise ValueError("count is required to start a new job.")
+            params = {k: (v if v is not None else self.DEFAULTS.get(k)) for k, v in given.items()}
+            if params["seed"] is None:
+                params["seed"] = random.randrange(2 ** 63)
+            if params["count"] < 1 or params["shard_size"] < 1:
+                raise ValueError("count and shard_size must be positive.")
+            if params["dedup_state"] and not params["dedup"]:
+                raise ValueError("dedup_state needs a dedup mode ('exact' or 'bloom').")
+            if params["dedup_state"]:
+                # resumes must start from the same state, whatever later runs add to the file
+                capacity = max(params["count"], STATE_CAPACITY)
+                load_deduper(params["dedup"], params["dedup_state"], capacity).save(self.dedup_base_path)
+            FileHandler.write_json_atomic(params, self.job_path)
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be positive.")
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_seconds = checkpoint_seconds
+        self.count = params["count"]
+        self.difficulty = params["difficulty"]
+        self.seed = params["seed"]
+        self.shard_size = params["shard_size"]
+        self.dedup = params.get("dedup")
+        self.dedup_state = params.get("dedup_state")
+
+    @property
+    def num_shards(self) -> int:
+        return (self.count + self.shard_size - 1) // self.shard_size
+
+    def _shard_count(self, shard: int) -> int:
+        return min(self.shard_size, self.count - shard * self.shard_size)
+
+    def _shard_path(self, shard: int, partial: bool = False) -> str:
+        suffix = ".partial.json" if partial else ".json"
+        return os.path.join(self.shard_dir, f"shard_{shard:05d}{suffix}")
+
+    def _load_shard(self, shard: int) -> List[List[List[int]]]:
+        return FileHandler.load_json(self._shard_path(shard))["puzzles"]
+
+    def done_count(self) -> int:
+        """Puzzles already checkpointed, including those in a partial shard."""
+        done = 0
+        for shard in range(self.num_shards):
+            if os.path.exists(self._shard_path(shard)):
+                done += self._shard_count(shard)
+            elif os.path.exists(self._shard_path(shard, partial=True)):
+                done += len(FileHandler.load_json(self._shard_path(shard, partial=True)).get("puzzles", []))
+        return done
+
+    def _checkpointed_puzzles(self) -> List[List[List[int]]]:
+        """Puzzles from completed shards and any partial shard, in generation order."""
+        result = []
+        for shard in range(self.num_shards):
+            if os.path.exists(self._shard_path(shard)):
+                result.extend(self._load_shard(shard))
+            elif os.path.exists(self._shard_path(shard, partial=True)):
+                result.extend(FileHandler.load_json(self._shard_path(shard, partial=True)).get("puzzles", []))
+        return result
+
+    def is_complete(self) -> bool:
+        return all(os.path.exists(self._shard_path(s)) for s in range(self.num_shards))
+
+    def run(self, progress: Optional[Callable[[int, int, float, Optional[float]], None]] = None) -> None:
+        """Generate every missing puzzle. `progress(done, total, per_second, eta_seconds)` is called after each one."""
+        generator = SudokuGenerator(difficulty=self.difficulty)
+        done = self.done_count()
+        deduper = None
+        if self.dedup_state:
+            deduper = load_deduper(self.dedup, self.dedup_base_path, capacity=max(self.count, STATE_CAPACITY))
+            # fail before generating anything rather than at the first shard's merge
+            check_mergeable(deduper, self.dedup_state)
+        elif self.dedup:
+            deduper = make_deduper(self.dedup, capacity=self.count)
+        if deduper is not None:
+            for puzzle in self._checkpointed_puzzles():
+                deduper.add(puzzle)
+        start = time.perf_counter()
+        made = 0
+        rate, eta = 0.0, None
+        for shard in range(self.num_shards):
+            if os.path.exists(self._shard_path(shard)):
+                continue
+            target = self._shard_count(shard)
+            partial_path = self._shard_path(shard, partial=True)
+            rng = random.Random(f"{self.seed}:{shard}")
+            puzzles = []
+            if os.path.exists(partial_path):
+                checkpoint = FileHandler.load_json(partial_path)
+                puzzles = checkpoint["puzzles"]
+                rng.setstate(_decode_rng_state(checkpoint["rng_state"]))
+            generator.rng = rng
+            since_checkpoint = 0
+            last_checkpoint = time.perf_counter()
+            while len(puzzles) < target:
+                puzzle = generator.generate()
+                if deduper is not None and not deduper.add(puzzle):
+                    continue
+                puzzles.append(puzzle)
+                made += 1
+                done += 1
+                since_checkpoint += 1
+                elapsed = time.perf_counter() - start
+                rate = made / elapsed if elapsed > 0 else 0.0
+                eta = (self.count - done) / rate if rate > 0 else None
+                due = (
+                    since_checkpoint >= self.checkpoint_every
+                    or time.perf_counter() - last_checkpoint >= self.checkpoint_seconds
+                )
+                if due and len(puzzles) < target:
+                    FileHandler.write_json_atomic(
+                        {"puzzles": puzzles, "rng_state": _encode_rng_state(rng.getstate())}, partial_path
+                    )
+                    # progress is informational only, so skip the fsync
+                    FileHandler.write_json_atomic(
+                        {"done": done, "total": self.count, "per_second": rate, "eta_seconds": eta},
+                        self.progress_path,
+                        fsync=False,
+                    )
+                    since_checkpoint = 0
+                    last_checkpoint = time.perf_counter()
+                if progress:
+                    progress(done, self.count, rate, eta)
+            FileHandler.write_json_atomic({"puzzles": puzzles}, self._shard_path(shard))
+            if self.dedup_state:
+                save_deduper(deduper, self.dedup_state)
+            FileHandler.write_json_atomic(
+                {"done": done, "total": self.count, "per_second": rate, "eta_seconds": eta},
+                self.progress_path,
+                fsync=False,
+            )
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        if self.dedup_state:
+            save_deduper(deduper, self.dedup_state)
+
+    def puzzles(self) -> List[List[List[int]]]:
+        """All generated puzzles in order. The job must be complete."""
+        if not self.is_complete():
+            raise RuntimeError(f"Job in '{self.job_dir}' is not complete yet.")
+        result = []
+        for shard in range(self.num_shards):
+            result.extend(self._load_shard(shard))
+        return result
@@ -0,0 +1,199 @@
+# gridcracker/portfolio.py
+
+import json
+import multiprocessing as mp
+import os
+import queue
+import random
+import time
+from typing import Dict, List, Optional
+
+from .solver import MRVSolver, PropagatingSolver, RandomRestartSolver, SudokuSolver
+from .utils.file_io import FileHandler
+from .validator import validate_grid
+
+# name -> solver class; every strategy is complete, so any finished run is a final answer
+STRATEGIES = {
+    "row_major": SudokuSolver,
+    "mrv": MRVSolver,
+    "random_restarts": RandomRestartSolver,
+    "propagation": PropagatingSolver,
+}
+
+
+def make_solver(name: str, grid: List[List[int]], seed: Optional[int] = None) -> SudokuSolver:
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{name}'. Choose from: {', '.join(STRATEGIES)}")
+    if name == "random_restarts":
+        return RandomRestartSolver(grid, seed=seed)
+    return STRATEGIES[name](grid)
+
+
+def _run_strategy(name: str, grid: List[List[int]], seed: Optional[int], results) -> None:
+    """Worker entry point: solve with one strategy and report (name, result, seconds)."""
+    start = time.perf_counter()
+    solved = make_solver(name, grid, seed).solve()
+    results.put((name, solved, time.perf_counter() - start))
+
+
+class PortfolioStats:
+    """Per-strategy race/win counters, optionally persisted to a JSON file."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.data: Dict[str, Dict[str, float]] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    loaded = json.load(f)
+                if isinstance(loaded, dict):
+                    self.data = loaded
+            except Exception:
+                self.data = {}
+
+    def _entry(self, name: str) -> Dict[str, float]:
+        return self.data.setdefault(name, {"races": 0, "wins": 0, "win_time": 0.0})
+
+    def record(self, entrants: List[str], winner: Optional[str], win_time: float) -> None:
+        """Count a race; win_time is the winner's own solve time, without process start-up."""
+        for name in entrants:
+            self._entry(name)["races"] += 1
+        if winner:
+            entry = self._entry(winner)
+            entry["wins"] += 1
+            entry["win_time"] += win_time
+
+    def mean_win_time(self, name: str) -> float:
+        entry = self.data.get(name, {})
+        wins = entry.get("wins", 0)
+        return entry.get("win_time", 0.0) / wins if wins else float("inf")
+
+    def win_rate(self, name: str) -> float:
+        # Laplace smoothing so untried strategies still get picked
+        entry = self.data.get(name, {})
+        return (entry.get("wins", 0) + 1) / (entry.get("races", 0) + 2)
+
+    def ranked(self, names: List[str]) -> List[str]:
+        # highest win rate first; among equals, the one that wins faster
+        return sorted(names, key=lambda n: (-self.win_rate(n), self.mean_win_time(n)))
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        # atomic, so concurrent runs never leave a truncated file (the last writer wins)
+        FileHandler.write_json_atomic(self.data, self.path)
+
+
+class PortfolioSolver:
+    """Race several search strategies in separate processes and keep the first answer.
+
+    Starting the worker processes costs a fixed overhead per solve (roughly 15-20 ms with
+    fork, far more with spawn), so the grid is first given to an in-process propagating
+    search capped at `quick_nodes` nodes. Most grids are settled there and no race is
+    run (`raced` stays False); only the hard ones pay for the processes. The quick attempt
+    is bounded by its node budget, not by `timeout`, which applies to the race.
+
+    When fewer workers than strategies are available, the best strategies by recorded
+    win rate are entered, with an occasional random pick so the mix keeps adapting.
+    """
+
+    EXPLORE_RATE = 0.1
+    QUICK_NODES = 200
+
+    def __init__(
+        self,
+        grid: List[List[int]],
+        strategies: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        stats: Optional[PortfolioStats] = None,
+        seed: Optional[int] = None,
+        quick_nodes: Optional[int] = QUICK_NODES,
+    ):
+        self.grid = grid
+        self.issues = validate_grid(grid)
+        self.strategies = list(strategies or STRATEGIES)
+        for name in self.strategies:
+            if name not in STRATEGIES:
+                raise ValueError(f"Unknown strategy '{name}'. Choose from: {', '.join(STRATEGIES)}")
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        self.max_workers = max_workers or len(self.strategies)
+        self.timeout = timeout
+        self.quick_nodes = quick_nodes
+        self.stats = stats or PortfolioStats()
+        self.rng = random.Random(seed)
+        self.winner: Optional[str] = None
+        self.timed_out = False
+        self.raced = False
+        self.elapsed = 0.0
+
+    def _pick_strategies(self) -> List[str]:
+        ranked = self.stats.ranked(self.strategies)
+        picked = ranked[: self.max_workers]
+        rest = ranked[self.max_workers:]
+        if rest and self.rng.random() < self.EXPLORE_RATE:
+            picked[-1] = self.rng.choice(rest)
+        return picked
+
+    def solve(self) -> Optional[List[List[int]]]:
+        """Solve the Sudoku. Returns solved grid or None (unsolvable, invalid or timed out)."""
+        self.winner = None
+        self.timed_out = False
+        self.raced = False
+        self.elapsed = 0.0
+        if self.issues:
+            return None
+        grid = [[int(v) for v in row] for row in self.grid]
+        start = time.perf_counter()
+        if self.quick_nodes:
+            quick = PropagatingSolver(grid, max_nodes=self.quick_nodes)
+            solved = quick.solve()
+            if not quick.out_of_budget:
+                # settled in-process: not a race, so the stats are left alone
+                self.winner = "propagation" if solved is not None else None
+                self.elapsed = time.perf_counter() - start
+                return solved
+        self.raced = True
+        entrants = self._pick_strategies()
+        ctx = mp.get_context()
+        results = ctx.Queue()
+        procs = [
+            ctx.Process(target=_run_strategy, args=(name, grid, self.rng.randrange(2 ** 32), results), daemon=True)
+            for name in entrants
+        ]
+        deadline = start + self.timeout if self.timeout else None
+        solved = None
+        win_time = 0.0
+        finished = False
+        try:
+            for p in procs:
+                p.start()
+            while not finished:
+                if deadline and time.perf_counter() >= deadline:
+                    self.timed_out = True
+                    break
+                try:
+                    name, result, seconds = results.get(timeout=0.05)
+                except queue.Empty:
+                    # every worker died without reporting
+                    if not any(p.is_alive() for p in procs) and results.empty():
+                        break
+                    continue
+                # strategies are exhaustive: the first finisher settles it either way
+                finished = True
+                solved = result
+                if result is not None:
+                    self.winner = name
+                    win_time = seconds
+        finally:
+            for p in procs:
+                if p.is_alive():
+                    p.terminate()
+            for p in procs:
+                p.join()
+            results.close()
+        self.elapsed = time.perf_counter() - start
+        self.stats.record(entrants, self.winner, win_time)
+        self.stats.save()
+        return solved
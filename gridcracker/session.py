@@ -0,0 +1,227 @@
+# gridcracker/session.py
+
+from typing import FrozenSet, List, Optional, Tuple
+from .models import Board
+from .solver import PropagatingSolver, UNITS
+from .validator import check_grid
+
+
+def _peers(r: int, c: int) -> List[Tuple[int, int]]:
+    br, bc = (r // 3) * 3, (c // 3) * 3
+    cells = {(r, cc) for cc in range(9)} | {(rr, c) for rr in range(9)}
+    cells |= {(rr, cc) for rr in range(br, br + 3) for cc in range(bc, bc + 3)}
+    cells.discard((r, c))
+    return sorted(cells)
+
+
+PEERS = [[_peers(r, c) for c in range(9)] for r in range(9)]
+UNIT_NAMES = [f"row {i + 1}" for i in range(9)] + [f"column {i + 1}" for i in range(9)] + [f"box {i + 1}" for i in range(9)]
+
+
+class Hint:
+    def __init__(self, row: int, col: int, value: int, technique: str, explanation: str):
+        self.row = row
+        self.col = col
+        self.value = value
+        self.technique = technique
+        self.explanation = explanation
+
+    def __repr__(self) -> str:
+        return f"Hint(r{self.row + 1}c{self.col + 1}={self.value}, {self.technique})"
+
+
+class SolveSession:
+    """Stateful solving session for interactive play.
+
+    Keeps per-unit digit counts and per-cell candidate masks up to date as single cells
+    are set or cleared, so candidates, conflicts and hints never need a full rescan.
+    Solutions found while checking solvability are cached and reused.
+    """
+
+    def __init__(self, grid: List[List[int]]):
+        self.givens = Board(check_grid(grid))
+        self.board = self.givens.copy()
+        # counts[unit][digit] -> how many cells in that unit hold the digit
+        self.row_counts = [[0] * 10 for _ in range(9)]
+        self.col_counts = [[0] * 10 for _ in range(9)]
+        self.box_counts = [[0] * 10 for _ in range(9)]
+        self._cands = [[0] * 9 for _ in range(9)]
+        self._solutions: List[List[List[int]]] = []
+        # sets of (cell, value) user entries known to make the board unsolvable
+        self._dead_ends: List[FrozenSet[Tuple[int, int]]] = []
+        for r in range(9):
+            for c in range(9):
+                v = self.board.get(r, c)
+                if v:
+                    self._count(r, c, v, 1)
+        for r in range(9):
+            for c in range(9):
+                self._refresh(r, c)
+
+    # --- incremental bookkeeping ---
+
+    def _count(self, r: int, c: int, v: int, delta: int) -> None:
+        self.row_counts[r][v] += delta
+        self.col_counts[c][v] += delta
+        self.box_counts[(r // 3) * 3 + c // 3][v] += delta
+
+    def _refresh(self, r: int, c: int) -> None:
+        if self.board.get(r, c):
+            self._cands[r][c] = 0
+            return
+        rc, cc, bc = self.row_counts[r], self.col_counts[c], self.box_counts[(r // 3) * 3 + c // 3]
+        mask = 0
+        for v in range(1, 10):
+            if not (rc[v] or cc[v] or bc[v]):
+                mask |= 1 << v
+        self._cands[r][c] = mask
+
+    def is_given(self, r: int, c: int) -> bool:
+        return self.givens.get(r, c) != 0
+
+    def set(self, r: int, c: int, v: int) -> None:
+        """Enter a value (1-9) in an empty or user-filled cell; 0 clears it."""
+        v = int(v)
+        if v < 0 or v > 9:
+            raise ValueError(f"Value {v} is out of range 0-9.")
+        if self.is_given(r, c):
+            raise ValueError(f"r{r + 1}c{c + 1} is a given and cannot be changed.")
+        old = self.board.get(r, c)
+        if old == v:
+            return
+        if old:
+            self._count(r, c, old, -1)
+        if v:
+            self._count(r, c, v, 1)
+        self.board.set(r, c, v)
+        self._refresh(r, c)
+        for pr, pc in PEERS[r][c]:
+            self._refresh(pr, pc)
+
+    def clear(self, r: int, c: int) -> None:
+        self.set(r, c, 0)
+
+    # --- queries ---
+
+    def candidates(self, r: int, c: int) -> List[int]:
+        mask = self._cands[r][c]
+        return [v for v in range(1, 10) if mask >> v & 1]
+
+    def candidate_grid(self) -> List[List[List[int]]]:
+        """Pencil marks for every cell (empty list for filled cells)."""
+        return [[self.candidates(r, c) for c in range(9)] for r in range(9)]
+
+    def conflicts(self) -> List[Tuple[int, int]]:
+        """Filled cells whose value repeats in their row, column or box."""
+        found = []
+        for r in range(9):
+            for c in range(9):
+                v = self.board.get(r, c)
+                if v and (self.row_counts[r][v] > 1 or self.col_counts[c][v] > 1 or self.box_counts[(r // 3) * 3 + c // 3][v] > 1):
+                    found.append((r, c))
+        return found
+
+    def is_complete(self) -> bool:
+        return self.board.find_empty() is None and not self.conflicts()
+
+    def _matching_solution(self) -> Optional[List[List[int]]]:
+        """A cached solution that agrees with every filled cell, if any."""
+        for sol in self._solutions:
+            if all(v == 0 or v == sol[r][c] for r, row in enumerate(self.board.grid) for c, v in enumerate(row)):
+                return sol
+        return None
+
+    def _entries(self) -> FrozenSet[Tuple[int, int]]:
+        """The user's entries (not givens) as (cell index, value) pairs."""
+        return frozenset(
+            (r * 9 + c, v)
+            for r, row in enumerate(self.board.grid)
+            for c, v in enumerate(row)
+            if v and not self.is_given(r, c)
+        )
+
+    def is_solvable(self) -> bool:
+        """Whether the current entries can still be completed to a valid grid."""
+        if self.conflicts():
+            return False
+        if self._matching_solution() is not None:
+            return True
+        # adding entries to a dead end can never make it solvable again
+        entries = self._entries()
+        if any(dead <= entries for dead in self._dead_ends):
+            return False
+        solved = PropagatingSolver(self.board.as_list()).solve()
+        if solved is None:
+            self._dead_ends.append(entries)
+            return False
+        self._solutions.append(solved)
+        return True
+
+    def _wrong_entry_hint(self) -> Optional[Hint]:
+        """Point at a user entry to clear, claiming it is wrong only when that is certain.
+
+        An entry whose removal makes the board solvable again is part of every conflict
+        if it is the only such entry; with several, any of them may be the mistake.
+        """
+        fixes = []
+        for cell, v in sorted(self._entries()):
+            r, c = divmod(cell, 9)
+            self.set(r, c, 0)
+            if self.is_solvable():
+                fixes.append((r, c, v))
+            self.set(r, c, v)
+        if len(fixes) == 1:
+            r, c, v = fixes[0]
+            return Hint(r, c, 0, "wrong entry",
+                        f"The {v} at r{r + 1}c{c + 1} cannot lead to a solution with your other entries; clear it.")
+        if fixes:
+            r, c, v = fixes[0]
+            return Hint(r, c, 0, "conflicting entries",
+                        f"Your entries cannot all be right; clearing the {v} at r{r + 1}c{c + 1} "
+                        f"(or one of {len(fixes) - 1} other entries) makes the board solvable again.")
+        # no single entry is to blame: suggest one that differs from a solution of the givens
+        solutions = self._solutions
+        if not solutions:
+            solved = PropagatingSolver(self.givens.as_list()).solve()
+            if solved is None:
+                return None
+            solutions = self._solutions = [solved]
+        sol = solutions[0]
+        for cell, v in sorted(self._entries()):
+            r, c = divmod(cell, 9)
+            if sol[r][c] != v:
+                return Hint(r, c, 0, "conflicting entries",
+                            f"Several entries need to change; the {v} at r{r + 1}c{c + 1} "
+                            f"differs from one solution of the puzzle, so try clearing it first.")
+        return None
+
+    def next_hint(self) -> Optional[Hint]:
+        """The next logical step with an explanation, or None if the board is full or stuck.
+
+        If the current entries cannot be completed, the hint has value 0 and points at an
+        entry to clear instead (see _wrong_entry_hint for when it is called wrong).
+        """
+        if not self.is_solvable():
+            return self._wrong_entry_hint()
+        for r in range(9):
+            for c in range(9):
+                mask = self._cands[r][c]
+                if mask and mask & (mask - 1) == 0:
+                    v = mask.bit_length() - 1
+                    return Hint(r, c, v, "naked single",
+                                f"r{r + 1}c{c + 1} can only be {v}: every other digit already appears in its row, column or box.")
+        for i, unit in enumerate(UNITS):
+            for v in range(1, 10):
+                spots = [(r, c) for r, c in unit if self._cands[r][c] >> v & 1]
+                if len(spots) == 1:
+                    r, c = spots[0]
+                    return Hint(r, c, v, "hidden single",
+                                f"{v} can only go in r{r + 1}c{c + 1} within {UNIT_NAMES[i]}.")
+        # no simple deduction: fall back to the cached solution
+        sol = self._matching_solution()
+        empty = self.board.find_empty()
+        if sol is None or empty is None:
+            return None
+        r, c = empty
+        return Hint(r, c, sol[r][c], "solution",
+                    f"No single-candidate step is available; the solution has {sol[r][c]} at r{r + 1}c{c + 1}.")
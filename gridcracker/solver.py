@@ -2,12 +2,16 @@
 
 from typing import List, Optional
 from .models import Board
+from .validator import ALL_DIGITS, validate_grid
 import copy
+import random
 
 
 class SudokuSolver:
     def __init__(self, grid: List[List[int]]):
-        self._original = Board(grid)
+        # reject malformed or contradictory grids up front instead of searching them
+        self.issues = validate_grid(grid)
+        self._original = Board(grid) if not self.issues else Board()
         self.board = self._original.copy()
 
     def _find_empty(self) -> Optional[tuple]:
@@ -31,6 +35,8 @@ class SudokuSolver:
 
     def solve(self) -> Optional[List[List[int]]]:
         """Solve the Sudoku. Returns solved grid or None."""
+        if self.issues:
+            return None
         self.board = self._original.copy()
         solved = self._backtrack()
         if solved:
@@ -64,6 +70,198 @@ class CountingSolver(SudokuSolver):
     def count_solutions(self, limit: int = 2) -> int:
         self.count = 0
         self.limit = limit
+        if self.issues:
+            return 0
         self.board = self._original.copy()
         self._backtrack_count()
         return self.count
+
+
+# --- Alternative search strategies (used by the portfolio solver) ---
+
+# the 27 units (rows, columns, boxes) as lists of (r, c)
+UNITS = (
+    [[(r, c) for c in range(9)] for r in range(9)]
+    + [[(r, c) for r in range(9)] for c in range(9)]
+    + [[(br + i, bc + j) for i in range(3) for j in range(3)] for br in range(0, 9, 3) for bc in range(0, 9, 3)]
+)
+
+
+class MRVSolver(SudokuSolver):
+    """Backtracking that always branches on the empty cell with the fewest candidates.
+
+    With `max_nodes`, the search gives up after that many nodes and sets `out_of_budget`,
+    so a None result then means "unknown" rather than "unsolvable".
+    """
+
+    def __init__(self, grid: List[List[int]], max_nodes: Optional[int] = None):
+        super().__init__(grid)
+        self.max_nodes = max_nodes
+        self.nodes = 0
+        self.cancelled = False
+        self.out_of_budget = False
+
+    def cancel(self) -> None:
+        """Ask a running solve (e.g. on another thread) to stop; it then returns None."""
+        self.cancelled = True
+
+    def _init_masks(self) -> None:
+        self.rows = [0] * 9
+        self.cols = [0] * 9
+        self.boxes = [0] * 9
+        for r in range(9):
+            for c in range(9):
+                v = self.board.get(r, c)
+                if v:
+                    self._mark(r, c, v)
+
+    def _mark(self, r: int, c: int, val: int) -> None:
+        bit = 1 << val
+        self.rows[r] |= bit
+        self.cols[c] |= bit
+        self.boxes[(r // 3) * 3 + c // 3] |= bit
+
+    def _place(self, r: int, c: int, val: int) -> None:
+        self.board.set(r, c, val)
+        self._mark(r, c, val)
+
+    def _unplace(self, r: int, c: int, val: int) -> None:
+        bit = ~(1 << val)
+        self.board.clear(r, c)
+        self.rows[r] &= bit
+        self.cols[c] &= bit
+        self.boxes[(r // 3) * 3 + c // 3] &= bit
+
+    def _candidates(self, r: int, c: int) -> int:
+        return ~(self.rows[r] | self.cols[c] | self.boxes[(r // 3) * 3 + c // 3]) & ALL_DIGITS
+
+    def _order_values(self, mask: int) -> List[int]:
+        return [v for v in range(1, 10) if mask >> v & 1]
+
+    def _select_cell(self) -> Optional[tuple]:
+        """Return (r, c, candidate_mask) of the most constrained empty cell, or None if full."""
+        best = None
+        best_count = 10
+        for r in range(9):
+            for c in range(9):
+                if self.board.get(r, c) == 0:
+                    mask = self._candidates(r, c)
+                    count = bin(mask).count("1")
+                    if count < best_count:
+                        best, best_count = (r, c, mask), count
+                        if count <= 1:
+                            return best
+        return best
+
+    def _backtrack(self) -> bool:
+        if self.cancelled:
+            return False
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            self.out_of_budget = True
+            return False
+        self.nodes += 1
+        cell = self._select_cell()
+        if not cell:
+            return True
+        r, c, mask = cell
+        for val in self._order_values(mask):
+            self._place(r, c, val)
+            if self._backtrack():
+                return True
+            self._unplace(r, c, val)
+        return False
+
+    def solve(self) -> Optional[List[List[int]]]:
+        if self.issues:
+            return None
+        self.board = self._original.copy()
+        self._init_masks()
+        self.nodes = 0
+        self.out_of_budget = False
+        if self._backtrack():
+            return self.board.as_list()
+        return None
+
+
+class RandomRestartSolver(MRVSolver):
+    """MRV search with a randomised digit order, restarted with a growing node budget."""
+
+    def __init__(self, grid: List[List[int]], seed: Optional[int] = None, restart_nodes: int = 200, growth: float = 2.0):
+        super().__init__(grid)
+        self.rng = random.Random(seed)
+        self.restart_nodes = restart_nodes
+        self.growth = growth
+        self.restarts = 0
+        self._node_limit = restart_nodes
+        self._aborted = False
+
+    def _order_values(self, mask: int) -> List[int]:
+        vals = super()._order_values(mask)
+        self.rng.shuffle(vals)
+        return vals
+
+    def _backtrack(self) -> bool:
+        if self.nodes >= self._node_limit:
+            self._aborted = True
+            return False
+        return super()._backtrack()
+
+    def solve(self) -> Optional[List[List[int]]]:
+        if self.issues:
+            return None
+        self.restarts = 0
+        self._node_limit = self.restart_nodes
+        while True:
+            self._aborted = False
+            solved = super().solve()
+            # a run that finished without hitting the budget searched everything
+            if solved or not self._aborted:
+                return solved
+            self.restarts += 1
+            self._node_limit = int(self._node_limit * self.growth)
+
+
+class PropagatingSolver(MRVSolver):
+    """MRV search that fills naked and hidden singles before every branch."""
+
+    def _propagate(self, trail: list) -> bool:
+        """Place forced values (recorded in trail). Returns False on a contradiction."""
+        changed = True
+        while changed:
+            changed = False
+            for r in range(9):
+                for c in range(9):
+                    if self.board.get(r, c) == 0:
+                        mask = self._candidates(r, c)
+                        if mask == 0:
+                            return False
+                        if mask & (mask - 1) == 0:
+                            val = mask.bit_length() - 1
+                            self._place(r, c, val)
+                            trail.append((r, c, val))
+                            changed = True
+            for unit in UNITS:
+                placed = 0
+                for r, c in unit:
+                    placed |= 1 << self.board.get(r, c)
+                for val in range(1, 10):
+                    if placed >> val & 1:
+                        continue
+                    spots = [(r, c) for r, c in unit if self.board.get(r, c) == 0 and self._candidates(r, c) >> val & 1]
+                    if not spots:
+                        return False
+                    if len(spots) == 1:
+                        r, c = spots[0]
+                        self._place(r, c, val)
+                        trail.append((r, c, val))
+                        placed |= 1 << val
+                        changed = True
+        return True
+
+    def _backtrack(self) -> bool:
+        trail = []
+        if self._propagate(trail) and super()._backtrack():
+            return True
+        for r, c, val in reversed(trail):
+            self._unplace(r, c, val)
+        return False
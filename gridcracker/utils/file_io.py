@@ -3,6 +3,8 @@
 import json
 from typing import List, Dict, Any, Union
 import os
+import tempfile
+from ..validator import check_grid
 
 
 class FileHandler:
@@ -17,42 +19,55 @@ class FileHandler:
         if lower.endswith(".json") or raw.strip().startswith("{") or raw.strip().startswith("["):
             try:
                 data = json.loads(raw)
+                grid = None
                 # Accept either a nested list or {"name": grid} or {"puzzle": grid}
                 if isinstance(data, list):
-                    return [[int(x) for x in row] for row in data]
-                if isinstance(data, dict):
+                    grid = data
+                elif isinstance(data, dict):
                     # try common keys
                     for key in ("grid", "puzzle", "board", "data"):
                         if key in data:
-                            return [[int(x) for x in row] for row in data[key]]
-                    # otherwise take first value that looks like a grid
-                    for v in data.values():
-                        if isinstance(v, list) and len(v) == 9:
-                            return [[int(x) for x in row] for row in v]
-                raise ValueError("JSON does not contain a valid 9x9 grid.")
+                            grid = data[key]
+                            break
+                    else:
+                        # otherwise take first value that looks like a grid
+                        for v in data.values():
+                            if isinstance(v, list) and len(v) == 9:
+                                grid = v
+                                break
+                if grid is None:
+                    raise ValueError("JSON does not contain a valid 9x9 grid.")
             except Exception as e:
                 raise ValueError(f"Failed to parse JSON: {e}")
-        else:
-            # assume txt: 9 lines of 9 numbers separated by spaces or nothing
-            lines = [ln.strip() for ln in raw.strip().splitlines() if ln.strip()]
-            grid = []
-            for ln in lines:
-                parts = ln.split()
-                if len(parts) == 9:
+            return check_grid(grid)
+        return FileHandler.parse_text(raw)
+
+    @staticmethod
+    def parse_text(raw: str) -> List[List[int]]:
+        """Parse 9 lines of 9 numbers (separated by spaces or not) and validate the grid."""
+        lines = [ln.strip() for ln in raw.strip().splitlines() if ln.strip()]
+        grid = []
+        for ln in lines:
+            parts = ln.split()
+            if len(parts) == 9:
+                try:
                     grid.append([int(x) for x in parts])
+                except ValueError:
+                    raise ValueError(f"Text format invalid: non-numeric value in line '{ln}'.")
+            else:
+                # maybe continuous digits like "003000700"
+                if len(ln) == 9 and all(ch.isdigit() for ch in ln):
+                    grid.append([int(ch) for ch in ln])
                 else:
-                    # maybe continuous digits like "003000700"
-                    if len(ln) == 9 and all(ch.isdigit() for ch in ln):
-                        grid.append([int(ch) for ch in ln])
-                    else:
-                        raise ValueError("Text format invalid: each line must have 9 digits/numbers.")
-            if len(grid) != 9:
-                raise ValueError("Text format invalid: must have 9 rows.")
-            return grid
+                    raise ValueError("Text format invalid: each line must have 9 digits/numbers.")
+        if len(grid) != 9:
+            raise ValueError("Text format invalid: must have 9 rows.")
+        return check_grid(grid)
 
     @staticmethod
     def save_json(puzzle: List[List[int]], path: str, name: str = "puzzle") -> None:
         """Save a puzzle into a JSON file under a named key (creates file if not exists)."""
+        puzzle = check_grid(puzzle)
         os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
         data = {}
         if os.path.exists(path):
@@ -85,8 +100,30 @@ class FileHandler:
         except Exception:
             return {}
 
+    @staticmethod
+    def write_json_atomic(data: Any, path: str, fsync: bool = True) -> None:
+        """Write JSON so that readers (or a restart after a crash) see either the old or the new file.
+
+        Pass fsync=False for data that is fine to lose on power failure (e.g. progress reports).
+        """
+        folder = os.path.dirname(path) or "."
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=folder, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
     @staticmethod
     def save_text(puzzle: List[List[int]], path: str) -> None:
+        puzzle = check_grid(puzzle)
         os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
         with open(path, "w", encoding="utf-8") as f:
             for row in puzzle:
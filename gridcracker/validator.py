@@ -0,0 +1,128 @@
+# gridcracker/validator.py
+
+import numbers
+import re
+from typing import Any, List, Optional
+
+SIZE = 9
+BOX = 3
+ALL_DIGITS = 0b1111111110  # bits 1..9 set
+
+
+class GridIssue:
+    """A single problem found in a grid, optionally pointing at the offending cell."""
+
+    def __init__(self, kind: str, message: str, row: Optional[int] = None, col: Optional[int] = None):
+        self.kind = kind  # "shape", "value", "duplicate" or "no_candidates"
+        self.message = message
+        self.row = row
+        self.col = col
+
+    def as_dict(self) -> dict:
+        return {"kind": self.kind, "message": self.message, "row": self.row, "col": self.col}
+
+    def __str__(self) -> str:
+        if self.row is not None and self.col is not None:
+            return f"r{self.row + 1}c{self.col + 1}: {self.message}"
+        if self.row is not None:
+            return f"row {self.row + 1}: {self.message}"
+        return self.message
+
+    def __repr__(self) -> str:
+        return f"GridIssue(kind={self.kind!r}, row={self.row}, col={self.col}, message={self.message!r})"
+
+
+class InvalidGridError(ValueError):
+    """Raised when a grid fails validation. The individual problems are in `issues`."""
+
+    def __init__(self, issues: List[GridIssue]):
+        self.issues = issues
+        super().__init__("; ".join(str(i) for i in issues))
+
+
+def _as_int(raw: Any) -> Optional[int]:
+    """Convert ints, integral floats and digit strings; None for anything else (e.g. 1.5, True)."""
+    if isinstance(raw, bool):
+        return None
+    if isinstance(raw, numbers.Integral):
+        return int(raw)
+    if isinstance(raw, float):
+        return int(raw) if raw.is_integer() else None
+    if isinstance(raw, str) and re.fullmatch(r"-?[0-9]+", raw.strip()):
+        return int(raw)
+    return None
+
+
+def validate_grid(grid: Any) -> List[GridIssue]:
+    """Check a grid in a single pass and return every problem found (empty list if valid).
+
+    Detects a wrong number of rows or row lengths, values outside 0-9, duplicate givens
+    in a row, column or box, and empty cells that have no candidate left.
+    """
+    if not isinstance(grid, (list, tuple)):
+        return [GridIssue("shape", "Grid must be a list of 9 rows.")]
+    issues: List[GridIssue] = []
+    if len(grid) != SIZE:
+        issues.append(GridIssue("shape", f"Grid must have 9 rows, got {len(grid)}."))
+
+    # bitmask of digits used per unit, plus where each digit was first seen
+    rows = [0] * SIZE
+    cols = [0] * SIZE
+    boxes = [0] * SIZE
+    row_seen = [{} for _ in range(SIZE)]
+    col_seen = [{} for _ in range(SIZE)]
+    box_seen = [{} for _ in range(SIZE)]
+    empties = []
+
+    for r, row in enumerate(grid[:SIZE]):
+        if not isinstance(row, (list, tuple)):
+            issues.append(GridIssue("shape", f"Row must be a list of 9 values, got {type(row).__name__} {row!r}.", row=r))
+            continue
+        if len(row) != SIZE:
+            issues.append(GridIssue("shape", f"Row must have 9 values, got {len(row)}.", row=r))
+            continue
+        for c, raw in enumerate(row):
+            v = _as_int(raw)
+            if v is None:
+                issues.append(GridIssue("value", f"Value {raw!r} is not a whole number.", r, c))
+                continue
+            if v < 0 or v > SIZE:
+                issues.append(GridIssue("value", f"Value {v} is out of range 0-9.", r, c))
+                continue
+            if v == 0:
+                empties.append((r, c))
+                continue
+            b = (r // BOX) * BOX + c // BOX
+            bit = 1 << v
+            if rows[r] & bit:
+                fc = row_seen[r][v]
+                issues.append(GridIssue("duplicate", f"{v} already given in row {r + 1} at r{r + 1}c{fc + 1}.", r, c))
+            if cols[c] & bit:
+                fr = col_seen[c][v]
+                issues.append(GridIssue("duplicate", f"{v} already given in column {c + 1} at r{fr + 1}c{c + 1}.", r, c))
+            if boxes[b] & bit:
+                fr, fc = box_seen[b][v]
+                issues.append(GridIssue("duplicate", f"{v} already given in box {b + 1} at r{fr + 1}c{fc + 1}.", r, c))
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+            row_seen[r].setdefault(v, c)
+            col_seen[c].setdefault(v, r)
+            box_seen[b].setdefault(v, (r, c))
+
+    # candidate check only makes sense once the grid is well formed
+    if any(i.kind == "shape" for i in issues):
+        return issues
+    for r, c in empties:
+        b = (r // BOX) * BOX + c // BOX
+        if rows[r] | cols[c] | boxes[b] == ALL_DIGITS:
+            issues.append(GridIssue("no_candidates", "Empty cell has no possible value.", r, c))
+    return issues
+
+
+def check_grid(grid: Any) -> List[List[int]]:
+    """Validate a grid and return it as a list of int rows; raise InvalidGridError otherwise."""
+    issues = validate_grid(grid)
+    if issues:
+        raise InvalidGridError(issues)
+    return [[int(v) for v in row] for row in grid]
@@ -5,7 +5,10 @@ import json
 import sys
 from gridcracker.utils.file_io import FileHandler
 from gridcracker.solver import SudokuSolver
+from gridcracker.dedup import STATE_CAPACITY, PuzzleStoreIndex, load_deduper, make_deduper, save_deduper
 from gridcracker.generator import SudokuGenerator
+from gridcracker.jobs import GenerationJob
+from gridcracker.portfolio import PortfolioSolver, PortfolioStats
 
 
 def cmd_solve(args):
@@ -19,7 +22,7 @@ def cmd_solve(args):
             return 2
     elif args.paste:
         try:
-            puzzle = [[int(x) for x in row.split()] for row in args.paste.strip().splitlines()]
+            puzzle = FileHandler.parse_text(args.paste)
         except Exception as e:
             print(f"Invalid pasted puzzle: {e}", file=sys.stderr)
             return 2
@@ -27,9 +30,19 @@ def cmd_solve(args):
         print("No input provided. Use --input <path> or --paste '<grid>'", file=sys.stderr)
         return 2
 
-    solver = SudokuSolver(puzzle)
+    if args.portfolio:
+        try:
+            solver = PortfolioSolver(puzzle, max_workers=args.workers, timeout=args.timeout, stats=PortfolioStats(args.stats))
+        except ValueError as e:
+            print(f"Invalid portfolio options: {e}", file=sys.stderr)
+            return 2
+    else:
+        solver = SudokuSolver(puzzle)
     solved = solver.solve()
     if solved:
+        if args.portfolio:
+            how = "" if solver.raced else " (in-process, no race needed)"
+            print(f"Solved by '{solver.winner}'{how} in {solver.elapsed:.3f}s")
         print("Solved puzzle:")
         for r in solved:
             print(" ".join(str(x) for x in r))
@@ -45,32 +58,104 @@ def cmd_solve(args):
                 print(f"Failed to save to '{args.output}': {e}", file=sys.stderr)
                 return 3
         return 0
+    elif args.portfolio and solver.timed_out:
+        print(f"Gave up after {args.timeout}s without a result.", file=sys.stderr)
+        return 1
     else:
         print("Could not solve the provided puzzle.", file=sys.stderr)
         return 1
 
 
+def save_generated(puzzles, difficulty, output):
+    if output.endswith(".json"):
+        # save as list of puzzles
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump({"difficulty": difficulty, "puzzles": puzzles}, f, indent=2)
+    else:
+        # append puzzles to a text file
+        with open(output, "w", encoding="utf-8") as f:
+            for i, p in enumerate(puzzles, start=1):
+                f.write(f"# Puzzle {i} - {difficulty}\n")
+                for r in p:
+                    f.write(" ".join(str(x) for x in r) + "\n")
+                f.write("\n")
+
+
+def print_job_progress(done, total, per_second, eta):
+    eta_text = f"{eta:.0f}s" if eta is not None else "?"
+    print(f"\r{done}/{total} puzzles, {per_second:.2f}/s, ETA {eta_text}   ", end="", file=sys.stderr, flush=True)
+
+
+def cmd_generate_job(args):
+    try:
+        # unspecified options (None) are taken from the job directory when resuming
+        job = GenerationJob(
+            args.job_dir,
+            args.count,
+            args.difficulty,
+            seed=args.seed,
+            shard_size=args.shard_size,
+            dedup=args.dedup,
+            dedup_state=args.dedup_state,
+            checkpoint_every=args.checkpoint_every,
+        )
+    except ValueError as e:
+        print(f"Cannot use job directory '{args.job_dir}': {e}", file=sys.stderr)
+        return 2
+    done = job.done_count()
+    if done:
+        print(f"Resuming job in {args.job_dir}: {done}/{job.count} puzzles already done")
+    try:
+        job.run(progress=print_job_progress)
+    except ValueError as e:
+        print(f"Cannot run job in '{args.job_dir}': {e}", file=sys.stderr)
+        return 2
+    print(file=sys.stderr)
+    print(f"Job complete: {job.count} {job.difficulty} puzzles in {args.job_dir}")
+    if args.output:
+        try:
+            save_generated(job.puzzles(), job.difficulty, args.output)
+            print(f"Saved generated puzzles to {args.output}")
+        except Exception as e:
+            print(f"Failed to save generated puzzles: {e}", file=sys.stderr)
+            return 3
+    return 0
+
+
 def cmd_generate(args):
+    if args.job_dir:
+        return cmd_generate_job(args)
+    if args.difficulty is None:
+        args.difficulty = "Medium"
+    if args.count is None:
+        args.count = 1
     gen = SudokuGenerator(difficulty=args.difficulty)
-    puzzles = [gen.generate() for _ in range(args.count)]
+    if args.dedup_state and not args.dedup:
+        print("--dedup-state needs --dedup exact|bloom", file=sys.stderr)
+        return 2
+    if args.dedup_state:
+        try:
+            deduper = load_deduper(args.dedup, args.dedup_state, capacity=max(args.count, STATE_CAPACITY))
+        except (OSError, ValueError) as e:
+            print(f"Cannot load dedup state '{args.dedup_state}': {e}", file=sys.stderr)
+            return 2
+    else:
+        deduper = make_deduper(args.dedup, capacity=args.count) if args.dedup else None
+    puzzles = []
+    while len(puzzles) < args.count:
+        p = gen.generate()
+        # skip puzzles equivalent to one already generated in this run
+        if deduper is None or deduper.add(p):
+            puzzles.append(p)
+    if args.dedup_state:
+        save_deduper(deduper, args.dedup_state)
     for i, p in enumerate(puzzles, start=1):
         print(f"\n--- Puzzle #{i} ({args.difficulty}) ---")
         for r in p:
             print(" ".join(str(x) for x in r))
     if args.output:
         try:
-            if args.output.endswith(".json"):
-                # save as list of puzzles
-                with open(args.output, "w", encoding="utf-8") as f:
-                    json.dump({"difficulty": args.difficulty, "puzzles": puzzles}, f, indent=2)
-            else:
-                # append puzzles to a text file
-                with open(args.output, "w", encoding="utf-8") as f:
-                    for i, p in enumerate(puzzles, start=1):
-                        f.write(f"# Puzzle {i} - {args.difficulty}\n")
-                        for r in p:
-                            f.write(" ".join(str(x) for x in r) + "\n")
-                        f.write("\n")
+            save_generated(puzzles, args.difficulty, args.output)
             print(f"\nSaved generated puzzles to {args.output}")
         except Exception as e:
             print(f"Failed to save generated puzzles: {e}", file=sys.stderr)
@@ -89,8 +174,19 @@ def cmd_save(args):
         except Exception as e:
             print(f"Error loading file '{args.input}': {e}", file=sys.stderr)
             return 2
+        storage = args.storage or "data/saved_puzzles.json"
+        index = PuzzleStoreIndex(storage)
+        index.refresh()
+        index.save()
+        if not args.allow_duplicate:
+            existing = index.find(puzzle)
+            if existing and existing != args.name:
+                print(f"Puzzle is equivalent to saved puzzle '{existing}'. Use --allow-duplicate to save anyway.", file=sys.stderr)
+                return 2
         try:
-            FileHandler.save_json(puzzle, args.storage or "data/saved_puzzles.json", args.name)
+            FileHandler.save_json(puzzle, storage, args.name)
+            index.add(args.name, puzzle)
+            index.save()
             print(f"Saved puzzle '{args.name}' into {args.storage or 'data/saved_puzzles.json'}")
             return 0
         except Exception as e:
@@ -109,16 +205,27 @@ def main():
     solve_p.add_argument("--input", "-i", help="Path to puzzle file (.txt or .json)")
     solve_p.add_argument("--paste", "-p", help="Paste puzzle text (9 lines of 9 numbers separated by spaces)")
     solve_p.add_argument("--output", "-o", help="Path to save solved puzzle (txt or .json)")
+    solve_p.add_argument("--portfolio", action="store_true", help="Race several search strategies and keep the first result")
+    solve_p.add_argument("--workers", type=int, help="Max strategies to race at once (portfolio mode)")
+    solve_p.add_argument("--timeout", type=float, help="Give up after this many seconds (portfolio mode)")
+    solve_p.add_argument("--stats", default="data/portfolio_stats.json", help="Strategy win statistics file (portfolio mode)")
 
     gen_p = sub.add_parser("generate", help="Generate Sudoku puzzles")
-    gen_p.add_argument("--difficulty", "-d", choices=["Easy", "Medium", "Hard"], default="Medium")
-    gen_p.add_argument("--count", "-c", type=int, default=1, help="Number of puzzles to generate")
+    gen_p.add_argument("--difficulty", "-d", choices=["Easy", "Medium", "Hard"], help="Difficulty (default: Medium)")
+    gen_p.add_argument("--count", "-c", type=int, help="Number of puzzles to generate (default: 1)")
     gen_p.add_argument("--output", "-o", help="Path to save generated puzzles (txt or .json)")
+    gen_p.add_argument("--job-dir", "-j", help="Checkpoint into this directory and resume from it if it exists")
+    gen_p.add_argument("--seed", type=int, help="Random seed for a job (default: random, stored in the job)")
+    gen_p.add_argument("--shard-size", type=int, help="Puzzles per checkpointed shard (job mode, default: 100)")
+    gen_p.add_argument("--checkpoint-every", type=int, default=10, help="Puzzles between checkpoints (job mode)")
+    gen_p.add_argument("--dedup", choices=["exact", "bloom"], help="Skip puzzles equivalent to one already generated")
+    gen_p.add_argument("--dedup-state", help="Persistent dedup file shared across runs (loaded first, updated after)")
 
     save_p = sub.add_parser("save", help="Save a puzzle into saved_puzzles.json")
     save_p.add_argument("--input", "-i", help="Path to puzzle file to save (.txt or .json)")
     save_p.add_argument("--name", "-n", help="Name/key to save puzzle under")
     save_p.add_argument("--storage", "-s", help="Storage JSON path (default: data/saved_puzzles.json)")
+    save_p.add_argument("--allow-duplicate", action="store_true", help="Save even if an equivalent puzzle is already stored")
 
     args = parser.parse_args()
 
@@ -1,16 +1,99 @@
 # app/streamlit_app.py
 
 import streamlit as st
+import io
 import json
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-from gridcracker.solver import SudokuSolver
+from gridcracker.solver import PropagatingSolver
+from gridcracker.dedup import PuzzleStoreIndex
 from gridcracker.generator import SudokuGenerator
+from gridcracker.session import SolveSession
 from gridcracker.utils.file_io import FileHandler
+from gridcracker.validator import InvalidGridError
+
+SAVED_PUZZLES_PATH = "data/saved_puzzles.json"
+
+# CPU time spent by this script run (Streamlit runs each rerun on its own thread);
+# background solves are measured on their worker thread and added in the footer
+_rerun_cpu_start = time.thread_time()
 
 # --- Streamlit App Config ---
 st.set_page_config(page_title="GridCracker", layout="wide", page_icon="🧩")
 
+
+# --- Cached helpers (survive reruns) ---
+@st.cache_data(show_spinner=False)
+def parse_uploaded(name: str, data: bytes):
+    buf = io.BytesIO(data)
+    buf.name = name
+    return FileHandler.load(buf)
+
+
+@st.cache_data(show_spinner=False)
+def parse_pasted(text: str):
+    return FileHandler.parse_text(text)
+
+
+@st.cache_data(show_spinner=False)
+def load_saved_puzzles(path: str, mtime: float):
+    # mtime is part of the cache key so edits to the file invalidate the entry
+    return FileHandler.load_json(path)
+
+
+@st.cache_resource(show_spinner=False)
+def get_generator(difficulty: str) -> SudokuGenerator:
+    # the AI model is loaded once per cached generator, not on every click
+    return SudokuGenerator(difficulty=difficulty)
+
+
+@st.cache_resource(show_spinner=False)
+def get_solve_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="gridcracker-solve")
+
+
+def run_solve(solver: PropagatingSolver):
+    """Executor task: the solve result and the CPU seconds it used on the worker thread."""
+    start = time.thread_time()
+    solved = solver.solve()
+    return solved, time.thread_time() - start
+
+
+def drop_solve_job() -> None:
+    """Forget this session's solve and stop its search so it frees the shared worker."""
+    job = st.session_state.pop("solve_job", None)
+    if job:
+        job["solver"].cancel()
+
+
+def show_solve_job() -> None:
+    job = st.session_state.get("solve_job")
+    if not job:
+        return
+    if not job["future"].done():
+        elapsed = time.perf_counter() - job["started"]
+        st.info(f"⏳ Solving Sudoku... {elapsed:.1f}s, {job['solver'].nodes} search nodes explored")
+        return
+    if not job.get("shown"):
+        # finished while the fragment was polling: one full rerun switches polling off
+        job["shown"] = True
+        st.rerun()
+    solved, _ = job["future"].result()
+    if solved:
+        st.success("✅ Sudoku Solved Successfully!")
+        st.table(solved)
+        if st.download_button(
+            "⬇️ Download Solved Puzzle (JSON)",
+            data=json.dumps(solved),
+            file_name="solved_sudoku.json",
+        ):
+            st.info("Solved puzzle downloaded successfully!")
+    else:
+        st.error("❌ Could not solve this Sudoku.")
+
+
 # --- Header ---
 st.markdown(
     """
@@ -69,34 +152,77 @@ with tab1:
         st.info("💡 Tip: Try loading a puzzle from the 'Load & Save' tab if you have saved puzzles!")
 
     puzzle = None
-    if uploaded_file:
-        puzzle = FileHandler.load(uploaded_file)
-    elif manual_input.strip():
-        try:
-            puzzle = [[int(x) for x in row.split()] for row in manual_input.strip().split("\n")]
-        except ValueError:
-            st.error("Invalid Sudoku format. Please enter 9 rows with 9 numbers each (0–9).")
+    try:
+        if uploaded_file:
+            puzzle = parse_uploaded(uploaded_file.name, uploaded_file.getvalue())
+        elif manual_input.strip():
+            puzzle = parse_pasted(manual_input)
+    except InvalidGridError as e:
+        st.error("Invalid Sudoku puzzle:\n" + "\n".join(f"- {issue}" for issue in e.issues))
+    except ValueError as e:
+        st.error(f"Invalid Sudoku format ({e}). Please enter 9 rows with 9 numbers each (0–9).")
+
+    # a previous solve only belongs on screen while its puzzle is still the current one
+    solve_job = st.session_state.get("solve_job")
+    if solve_job and solve_job["puzzle_key"] != str(puzzle):
+        drop_solve_job()
+        solve_job = None
 
     if st.button("🧩 Solve Puzzle"):
         if puzzle:
-            with st.spinner("Solving Sudoku..."):
-                solver = SudokuSolver(puzzle)
-                solved = solver.solve()
-                time.sleep(1.5)
-            if solved:
-                st.success("✅ Sudoku Solved Successfully!")
-                st.table(solved)
-                if st.download_button(
-                    "⬇️ Download Solved Puzzle (JSON)",
-                    data=json.dumps(solved),
-                    file_name="solved_sudoku.json",
-                ):
-                    st.info("Solved puzzle downloaded successfully!")
-            else:
-                st.error("❌ Could not solve this Sudoku.")
+            # run the search in a background worker; the status box below polls it
+            drop_solve_job()
+            solver = PropagatingSolver(puzzle)
+            future = get_solve_executor().submit(run_solve, solver)
+            solve_job = st.session_state["solve_job"] = {
+                "solver": solver,
+                "future": future,
+                "started": time.perf_counter(),
+                "puzzle_key": str(puzzle),
+            }
+            # counted in the footer once it finishes, even if the job is dropped first
+            st.session_state.setdefault("uncounted_solves", []).append(future)
         else:
             st.warning("Please upload or enter a Sudoku puzzle first.")
 
+    if solve_job:
+        pending = not solve_job["future"].done()
+        if not pending:
+            solve_job["shown"] = True
+        # while pending, only this fragment reruns (twice a second), not the whole script
+        st.fragment(show_solve_job, run_every=0.5 if pending else None)()
+
+    # --- Interactive help: reuse one SolveSession per puzzle across reruns ---
+    if puzzle:
+        key = str(puzzle)
+        if st.session_state.get("session_key") != key:
+            st.session_state["session_key"] = key
+            st.session_state["solve_session"] = SolveSession(puzzle)
+        session = st.session_state["solve_session"]
+
+        hint_col, cand_col = st.columns(2)
+        with hint_col:
+            if st.button("💡 Next Hint"):
+                hint = session.next_hint()
+                if hint:
+                    session.set(hint.row, hint.col, hint.value)
+                    if hint.value:
+                        st.info(f"r{hint.row + 1}c{hint.col + 1} = {hint.value} ({hint.technique}): {hint.explanation}")
+                    else:
+                        st.warning(f"Cleared r{hint.row + 1}c{hint.col + 1}: {hint.explanation}")
+                elif session.is_complete():
+                    st.success("Puzzle complete!")
+                else:
+                    st.warning("No hint available: the current entries cannot be completed.")
+        with cand_col:
+            show_candidates = st.checkbox("✏️ Show candidates")
+        if show_candidates:
+            pencil = session.candidate_grid()
+            st.table([
+                [str(session.board.get(r, c)) if session.board.get(r, c) else "".join(map(str, pencil[r][c])) for c in range(9)]
+                for r in range(9)
+            ])
+
 # --- Generate Sudoku Tab ---
 with tab2:
     st.header("🎲 Generate Sudoku Puzzle")
@@ -109,9 +235,8 @@ with tab2:
 
     if st.button("✨ Generate Puzzle"):
         with st.spinner("Generating Sudoku Puzzle..."):
-            generator = SudokuGenerator(difficulty=difficulty)
+            generator = get_generator(difficulty)
             puzzles = [generator.generate() for _ in range(num_puzzles)]
-            time.sleep(1.5)
 
         for i, puzzle in enumerate(puzzles):
             st.success(f"{difficulty} Puzzle #{i + 1}")
@@ -131,8 +256,18 @@ with tab3:
 
     if st.button("💾 Save to JSON"):
         try:
+            existing = None
+            index = PuzzleStoreIndex(SAVED_PUZZLES_PATH)
             if puzzle:
-                FileHandler.save_json(puzzle, f"data/saved_puzzles.json", save_name)
+                index.refresh()
+                index.save()
+                existing = index.find(puzzle)
+            if existing and existing != save_name:
+                st.warning(f"This puzzle is equivalent to the saved puzzle '{existing}'.")
+            elif puzzle:
+                FileHandler.save_json(puzzle, SAVED_PUZZLES_PATH, save_name)
+                index.add(save_name, puzzle)
+                index.save()
                 st.success(f"Puzzle '{save_name}' saved successfully!")
             else:
                 st.warning("No puzzle to save! Generate or solve one first.")
@@ -140,8 +275,8 @@ with tab3:
             st.error(f"Error while saving puzzle: {e}")
 
     st.subheader("📂 Load Saved Puzzles")
-    try:
-        saved_data = FileHandler.load_json("data/saved_puzzles.json")
+    if os.path.exists(SAVED_PUZZLES_PATH):
+        saved_data = load_saved_puzzles(SAVED_PUZZLES_PATH, os.path.getmtime(SAVED_PUZZLES_PATH))
         saved_keys = list(saved_data.keys())
         if saved_keys:
             selected = st.selectbox("Select a saved puzzle", saved_keys)
@@ -150,8 +285,23 @@ with tab3:
                 st.table(np.array(saved_data[selected]))
         else:
             st.info("No saved puzzles found.")
-    except FileNotFoundError:
+    else:
         st.info("No saved puzzles file found yet. Save one to create it.")
 
 st.markdown("---")
 st.caption("🧩 Built with ❤️ using Python, Streamlit, and classic Sudoku logic.")
+
+# --- Per-rerun server CPU time (script thread plus background solves finished since the last rerun) ---
+rerun_cpu_ms = (time.thread_time() - _rerun_cpu_start) * 1000
+uncounted = st.session_state.get("uncounted_solves", [])
+finished = [f for f in uncounted if f.done()]
+solve_cpu_ms = sum(f.result()[1] for f in finished) * 1000
+uncounted[:] = [f for f in uncounted if f not in finished]
+rerun_cpu_ms += solve_cpu_ms
+cpu_history = st.session_state.setdefault("rerun_cpu_ms", [])
+cpu_history.append(rerun_cpu_ms)
+del cpu_history[:-50]
+with st.sidebar.expander("⏱️ Rerun cost"):
+    st.write(f"This rerun: {rerun_cpu_ms:.1f} ms CPU ({solve_cpu_ms:.1f} ms in background solves)")
+    st.write(f"Average of last {len(cpu_history)}: {sum(cpu_history) / len(cpu_history):.1f} ms CPU")
+    st.line_chart(cpu_history)